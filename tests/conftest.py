@@ -1,85 +1,389 @@
 import pytest
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 import psycopg2
+import psycopg2.pool
 from psycopg2.extras import RealDictCursor
+from concurrent.futures import ThreadPoolExecutor
+import os
 import time
+import weakref
 
-# Database connection fixture
-@pytest.fixture(scope='module')
-def db_connection():
-    """Database connection fixture for direct database testing."""
-    conn_str = "host=localhost dbname=cleaning_tracker user=cleaning_user password=cleaning_pass"
+DB_CONN_STR = "host=localhost dbname=cleaning_tracker user=cleaning_user password=cleaning_pass"
+
+# Advisory lock key serialising the one-time seed across pytest-xdist workers
+SEED_LOCK_ID = 727001
+
+# Keep-alive connections held open to PostgREST; concurrent helpers never
+# run more requests at once than this, so every call reuses a pooled socket
+API_POOL_SIZE = 10
+
+# Test-only bcrypt work factor: the minimum pgcrypto accepts, since hash
+# strength is irrelevant here. Hashes that tests and fixtures create directly
+# in SQL pass it to gen_salt('bf', %s); register_user/login hash through
+# PostgREST at the server's default cost.
+TEST_BCRYPT_COST = 4
+
+# bcrypt hash of 'password123' at TEST_BCRYPT_COST, precomputed so seeding does no hashing
+SEED_PASSWORD_HASH = "$2a$04$S9B.i/6Xpzp8ibH3Sogt.e4E2kGz5WVW.tKUCSib1j.79YcmR4r76"
+
+# Seed data restored before the session and after every test that writes
+SEED_USERS = [
+    ('user1', SEED_PASSWORD_HASH),
+    ('user2', SEED_PASSWORD_HASH),
+    ('user3', SEED_PASSWORD_HASH),
+]
+
+SEED_TASKS = [
+    ('Kitchen Cleaning', 'Clean the kitchen surfaces and floor.'),
+    ('Bathroom Cleaning', 'Clean the toilet, shower, and sink.'),
+    ('Living Room Tidying', 'Tidy up the living room area.'),
+    ('Trash Duty', 'Take out the trash and recycling.'),
+    ('Vacuuming', 'Vacuum all carpets and rugs.'),
+    ('Dishwashing', 'Wash all dirty dishes.'),
+]
+
+SEED_ASSIGNMENTS = [(1, 1), (2, 2), (3, 3), (4, 1), (5, 2), (6, 3)]
+
+
+# Prepared INSERT for each seeded table, keyed by statement name
+RESEED_STATEMENTS = {
+    'reseed_users': ("INSERT INTO public.users (username, password_hash) VALUES {}", SEED_USERS),
+    'reseed_tasks': ("INSERT INTO public.tasks (task_name, description) VALUES {}", SEED_TASKS),
+    'reseed_assignments': ("INSERT INTO public.task_assignments (task_id, user_id) VALUES {}",
+                           SEED_ASSIGNMENTS),
+}
+
+# Connections that already hold the reseed prepared statements
+_prepared_conns = weakref.WeakSet()
+
+
+def _prepare_reseed(conn):
+    """PREPARE the reseed INSERTs so the server parses and plans them once per connection.
+
+    All three PREPAREs are sent as one statement batch.
+    """
+    statements = []
+    for name, (sql, rows) in RESEED_STATEMENTS.items():
+        width = len(rows[0])
+        placeholders = ', '.join(
+            '(' + ', '.join(f'${i * width + j + 1}' for j in range(width)) + ')'
+            for i in range(len(rows))
+        )
+        statements.append(f"PREPARE {name} AS {sql.format(placeholders)}")
+    with conn.cursor() as cursor:
+        cursor.execute(';\n'.join(statements))
+    _prepared_conns.add(conn)
+
+
+def _matches_seed(cursor):
+    """Check whether the tables still hold exactly the seed data.
+
+    Rows are only ever removed by TRUNCATE, so matching counts and max ids
+    mean nothing was added, and untouched completion/review columns mean no
+    assignment was completed or reviewed.
+    """
+    cursor.execute("""
+        SELECT
+            (SELECT count(*) = %s AND coalesce(max(user_id), 0) = %s FROM public.users)
+            AND (SELECT count(*) = %s AND coalesce(max(task_id), 0) = %s FROM public.tasks)
+            AND (SELECT count(*) = %s AND coalesce(max(assignment_id), 0) = %s
+                        AND count(completed_at) = 0 AND count(is_approved) = 0
+                 FROM public.task_assignments)
+    """, (len(SEED_USERS), len(SEED_USERS), len(SEED_TASKS), len(SEED_TASKS),
+          len(SEED_ASSIGNMENTS), len(SEED_ASSIGNMENTS)))
+    return cursor.fetchone()[0]
+
+
+def reseed_db(conn):
+    """Truncate all tables, restart sequences and re-insert the seed data.
+
+    Does nothing if the tables already hold exactly the seed data.
+    """
+    with conn.cursor() as cursor:
+        if _matches_seed(cursor):
+            conn.rollback()
+            return
+
+    if conn not in _prepared_conns:
+        _prepare_reseed(conn)
+
+    # TRUNCATE and every EXECUTE go to the server as one statement batch
+    statements = ["TRUNCATE public.users, public.tasks, public.task_assignments RESTART IDENTITY CASCADE"]
+    params = []
+    for name, (_, rows) in RESEED_STATEMENTS.items():
+        row_params = [value for row in rows for value in row]
+        statements.append(f"EXECUTE {name} ({', '.join(['%s'] * len(row_params))})")
+        params.extend(row_params)
+
+    with conn.cursor() as cursor:
+        cursor.execute(';\n'.join(statements), params)
+
+    conn.commit()
+
+# Database connection pool fixture
+@pytest.fixture(scope='session')
+def _db_pool():
+    """Connection pool shared by every test in the session."""
     try:
-        conn = psycopg2.connect(conn_str)
-        yield conn
-        conn.close()
+        pool = psycopg2.pool.ThreadedConnectionPool(minconn=2, maxconn=8, dsn=DB_CONN_STR)
     except psycopg2.OperationalError as e:
         pytest.fail(f"DB connection failed: {e}")
+    yield pool
+    pool.closeall()
+
+# Database connection fixture
+@pytest.fixture
+def db_connection(_db_pool):
+    """Database connection fixture for direct database testing."""
+    conn = _db_pool.getconn()
+    yield conn
+    # Discard anything left uncommitted before handing the connection back
+    conn.rollback()
+    _db_pool.putconn(conn)
+
+# bcrypt cost fixture
+@pytest.fixture(scope='session')
+def bcrypt_cost():
+    """bcrypt work factor for password hashes created by tests in SQL."""
+    return TEST_BCRYPT_COST
+
+# Database invariants fixture
+@pytest.fixture(scope='session')
+def db_invariants(_db_pool):
+    """Facts about the database instance that no test changes, queried once per session."""
+    conn = _db_pool.getconn()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT
+                    EXISTS (SELECT 1 FROM information_schema.schemata WHERE schema_name = 'api'),
+                    EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pgcrypto'),
+                    crypt('test', gen_salt('bf', %s))
+            """, (TEST_BCRYPT_COST,))
+            api_schema_exists, pgcrypto_enabled, pgcrypto_sample_hash = cursor.fetchone()
+        conn.rollback()
+    finally:
+        _db_pool.putconn(conn)
+    return {
+        'api_schema_exists': api_schema_exists,
+        'pgcrypto_enabled': pgcrypto_enabled,
+        'pgcrypto_sample_hash': pgcrypto_sample_hash,
+    }
+
+# Catalog snapshot fixture
+@pytest.fixture(scope='session')
+def catalog_snapshot(_db_pool):
+    """Columns, foreign keys and unique constraints of the public schema, read in one query.
+
+    Returns a dict with:
+      'columns': table name -> column rows (dicts with column_name, data_type,
+                 is_nullable and column_default) in ordinal order
+      'fks':     set of (table, column, foreign_table, foreign_column)
+      'uniques': set of (table, column)
+    """
+    conn = _db_pool.getconn()
+    try:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute("""
+                SELECT * FROM (
+                    SELECT
+                        'columns' AS kind,
+                        table_name::text,
+                        column_name::text,
+                        data_type::text,
+                        is_nullable::text,
+                        column_default::text,
+                        NULL::text AS foreign_table_name,
+                        NULL::text AS foreign_column_name,
+                        ordinal_position::int AS position
+                    FROM information_schema.columns
+                    WHERE table_schema = 'public'
+                    UNION ALL
+                    SELECT
+                        'fk', tc.table_name, kcu.column_name, NULL, NULL, NULL,
+                        ccu.table_name, ccu.column_name, NULL
+                    FROM information_schema.table_constraints AS tc
+                    JOIN information_schema.key_column_usage AS kcu
+                        ON tc.constraint_name = kcu.constraint_name
+                    JOIN information_schema.constraint_column_usage AS ccu
+                        ON ccu.constraint_name = tc.constraint_name
+                    WHERE tc.constraint_type = 'FOREIGN KEY'
+                    AND tc.table_schema = 'public'
+                    UNION ALL
+                    SELECT
+                        'unique', tc.table_name, kcu.column_name, NULL, NULL, NULL,
+                        NULL, NULL, NULL
+                    FROM information_schema.table_constraints AS tc
+                    JOIN information_schema.key_column_usage AS kcu
+                        ON tc.constraint_name = kcu.constraint_name
+                    WHERE tc.constraint_type = 'UNIQUE'
+                    AND tc.table_schema = 'public'
+                ) AS catalog
+                ORDER BY kind, table_name, position, column_name
+            """)
+            rows = cursor.fetchall()
+        conn.rollback()
+    finally:
+        _db_pool.putconn(conn)
+
+    snapshot = {'columns': {}, 'fks': set(), 'uniques': set()}
+    for row in rows:
+        if row['kind'] == 'columns':
+            snapshot['columns'].setdefault(row['table_name'], []).append(row)
+        elif row['kind'] == 'fk':
+            snapshot['fks'].add((row['table_name'], row['column_name'],
+                                 row['foreign_table_name'], row['foreign_column_name']))
+        else:
+            snapshot['uniques'].add((row['table_name'], row['column_name']))
+    return snapshot
+
+def _orjson_response_hook(response, *args, **kwargs):
+    """Response hook that makes response.json() decode the body with orjson."""
+    def json():
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
+            raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos)
+
+    response.json = json
+    return response
+
+class BaseUrlSession(requests.Session):
+    """requests.Session that prepends a base URL to relative paths."""
+
+    def __init__(self, base_url):
+        super().__init__()
+        self.base_url = base_url
+        self.hooks['response'].append(_orjson_response_hook)
+
+    def request(self, method, url, *args, **kwargs):
+        if not url.startswith('http'):
+            url = f"{self.base_url}{url}"
+        # Encode JSON bodies with orjson; the session already sends the JSON Content-Type
+        if kwargs.get('json') is not None:
+            kwargs['data'] = orjson.dumps(kwargs.pop('json'))
+        return super().request(method, url, *args, **kwargs)
+
+    def get_many(self, urls):
+        """GET independent URLs concurrently over the pooled connections, in order."""
+        with ThreadPoolExecutor(max_workers=min(len(urls), API_POOL_SIZE)) as executor:
+            return list(executor.map(self.get, urls))
+
+    def post_many(self, url, payloads):
+        """POST each JSON payload to url concurrently, returning responses in order."""
+        with ThreadPoolExecutor(max_workers=min(len(payloads), API_POOL_SIZE)) as executor:
+            return list(executor.map(lambda payload: self.post(url, json=payload), payloads))
 
 # API client fixture
-@pytest.fixture(scope='module')
+@pytest.fixture(scope='session')
 def api_client():
     """API client fixture for testing PostgREST endpoints."""
     base_url = "http://localhost:3000"
     
-    # Wait for API to be ready
-    max_retries = 30
-    for i in range(max_retries):
+    # Wait for API to be ready, backing off from 50ms up to 1s between attempts
+    delay = 0.05
+    deadline = time.monotonic() + 30
+    while True:
         try:
-            response = requests.get(f"{base_url}/")
+            response = requests.get(f"{base_url}/", timeout=2)
             if response.status_code == 200:
                 break
-        except requests.exceptions.ConnectionError:
-            if i == max_retries - 1:
-                pytest.fail("API not accessible after 30 retries")
-            time.sleep(1)
-    
-    # Create a session with the base URL configured
-    session = requests.Session()
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            pass
+        if time.monotonic() >= deadline:
+            pytest.fail("API not accessible after 30 seconds")
+        time.sleep(delay)
+        delay = min(delay * 1.5, 1.0)
     
-    # Override the request method to prepend base_url for relative URLs
-    original_request = session.request
-    
-    def request_with_base_url(method, url, *args, **kwargs):
-        if not url.startswith('http'):
-            url = f"{base_url}{url}"
-        return original_request(method, url, *args, **kwargs)
-    
-    session.request = request_with_base_url
-    return session
+    # Keep-alive connections are reused by every API test in the session.
+    # Transient gateway errors are retried with backoff; after the last attempt
+    # the error response is returned so the test's own assertion reports it.
+    session = BaseUrlSession(base_url)
+    retries = Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504],
+                    allowed_methods=frozenset(['GET', 'HEAD', 'POST']), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=API_POOL_SIZE, pool_block=True,
+                          max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    # Default headers set once here are merged into every request by the session
+    session.headers.update({
+        'Content-Type': 'application/json',
+        'Accept': 'application/json',
+        'Prefer': 'return=representation',
+    })
+    # Open a pooled connection with a cheap request; '/' would regenerate the
+    # OpenAPI document, which openapi_root fetches once when a test needs it
+    session.get('/tasks?limit=0')
+    yield session
+    session.close()
+
+# Cached API root response
+@pytest.fixture(scope='session')
+def openapi_root(api_client):
+    """The PostgREST root (OpenAPI document) response, fetched once per session."""
+    return api_client.get('/')
 
-# Fixture to clean the database before tests
-@pytest.fixture(autouse=True)
-def clean_db(db_connection):
-    """Clean database and reset to initial state before each test."""
+# Fixture to seed the database once per test session
+@pytest.fixture(scope='session', autouse=True)
+def seeded_db(_db_pool, tmp_path_factory):
+    """Reset the database to its initial state once for the whole session.
+
+    Read-only tests rely on this seed data directly; tests that write
+    request fresh_db so the seed is still intact for whoever runs next.
+    Under pytest-xdist only the first worker seeds, the others wait for it.
+    """
+    conn = _db_pool.getconn()
+    try:
+        if os.environ.get('PYTEST_XDIST_WORKER') is None:
+            reseed_db(conn)
+            return
+
+        marker = tmp_path_factory.getbasetemp().parent / 'db_seeded'
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_lock(%s)", (SEED_LOCK_ID,))
+        try:
+            if not marker.exists():
+                reseed_db(conn)
+                marker.touch()
+        finally:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", (SEED_LOCK_ID,))
+            conn.commit()
+    finally:
+        _db_pool.putconn(conn)
+
+# Fixture for tests that modify the database
+@pytest.fixture
+def fresh_db(request, seeded_db, db_connection):
+    """Keep the database in its seeded state around a test that writes.
+
+    Direct database tests run inside a savepoint that is rolled back on
+    teardown. API tests write through PostgREST's own connections, which a
+    savepoint cannot see, so the seed data is restored after them instead.
+    """
+    if 'api_client' in request.fixturenames:
+        yield
+        reseed_db(db_connection)
+        return
+
+    with db_connection.cursor() as cursor:
+        cursor.execute("SAVEPOINT test_sp")
+    yield
     with db_connection.cursor() as cursor:
-        # Truncate all tables and restart sequences
-        cursor.execute("""
-            TRUNCATE public.users, public.tasks, public.task_assignments 
-            RESTART IDENTITY CASCADE
-        """)
-        
-        # Re-seed with test data
-        cursor.execute("""
-            INSERT INTO public.users (username, password_hash) VALUES
-            ('user1', crypt('password123', gen_salt('bf'))),
-            ('user2', crypt('password123', gen_salt('bf'))),
-            ('user3', crypt('password123', gen_salt('bf')));
-        """)
-        
-        cursor.execute("""
-            INSERT INTO public.tasks (task_name, description) VALUES
-            ('Kitchen Cleaning', 'Clean the kitchen surfaces and floor.'),
-            ('Bathroom Cleaning', 'Clean the toilet, shower, and sink.'),
-            ('Living Room Tidying', 'Tidy up the living room area.'),
-            ('Trash Duty', 'Take out the trash and recycling.'),
-            ('Vacuuming', 'Vacuum all carpets and rugs.'),
-            ('Dishwashing', 'Wash all dirty dishes.');
-        """)
-        
-        cursor.execute("""
-            INSERT INTO public.task_assignments (task_id, user_id) VALUES
-            (1, 1), (2, 2), (3, 3), (4, 1), (5, 2), (6, 3);
-        """)
-        
-    db_connection.commit() 
\ No newline at end of file
+        cursor.execute("ROLLBACK TO SAVEPOINT test_sp")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(items):
+    """Keep every test that writes to the database on the same xdist worker.
+
+    All workers share one database and one PostgREST instance, so tests
+    using fresh_db must not interleave; read-only tests spread freely.
+    Runs before xdist's own hook, which turns the markers into groups.
+    """
+    for item in items:
+        if 'fresh_db' in item.fixturenames:
+            item.add_marker(pytest.mark.xdist_group('shared_db'))
@@ -4,17 +4,15 @@ import requests
 class TestPostgRESTAPI:
     """Test PostgREST API endpoints."""
     
-    def test_api_root_endpoint(self, api_client):
+    def test_api_root_endpoint(self, openapi_root):
         """Test that the API root endpoint is accessible."""
-        response = api_client.get('/')
-        assert response.status_code == 200
+        assert openapi_root.status_code == 200
     
-    def test_openapi_specification(self, api_client):
+    def test_openapi_specification(self, openapi_root):
         """Test that OpenAPI specification is available."""
-        response = api_client.get('/')
-        assert response.status_code == 200
+        assert openapi_root.status_code == 200
         # Should return OpenAPI spec
-        assert 'openapi' in response.text.lower() or 'swagger' in response.text.lower()
+        assert 'openapi' in openapi_root.text.lower() or 'swagger' in openapi_root.text.lower()
     
     def test_users_table_endpoint(self, api_client):
         """Test that users table is accessible via API."""
@@ -74,12 +72,11 @@ class TestPostgRESTAPI:
         response = api_client.get('/nonexistent_table')
         assert response.status_code == 404
     
-    def test_cors_headers(self, api_client):
+    def test_cors_headers(self, openapi_root):
         """Test that CORS headers are present (if configured)."""
-        response = api_client.get('/')
         # This test is more about ensuring the API responds properly
         # CORS headers might not be configured yet
-        assert response.status_code == 200
+        assert openapi_root.status_code == 200
     
     def test_content_type_headers(self, api_client):
         """Test that proper content-type headers are returned."""
@@ -87,23 +84,33 @@ class TestPostgRESTAPI:
         assert response.status_code == 200
         assert 'application/json' in response.headers.get('content-type', '')
 
+@pytest.fixture(scope='class')
+def error_responses(api_client):
+    """Responses to the malformed requests below, fetched concurrently."""
+    urls = [
+        '/users?username=invalid_syntax',
+        '/users?nonexistent_column=eq.test',
+        '/task_assignments?select=*,invalid_table(column)',
+    ]
+    return dict(zip(urls, api_client.get_many(urls)))
+
 class TestAPIErrorHandling:
     """Test API error handling."""
     
-    def test_invalid_filter_syntax(self, api_client):
+    def test_invalid_filter_syntax(self, error_responses):
         """Test that invalid filter syntax returns proper error."""
-        response = api_client.get('/users?username=invalid_syntax')
+        response = error_responses['/users?username=invalid_syntax']
         # Should return 400 or similar error
         assert response.status_code in [400, 422]
     
-    def test_nonexistent_column_filter(self, api_client):
+    def test_nonexistent_column_filter(self, error_responses):
         """Test that filtering by non-existent column returns error."""
-        response = api_client.get('/users?nonexistent_column=eq.test')
+        response = error_responses['/users?nonexistent_column=eq.test']
         assert response.status_code in [400, 422]
     
-    def test_invalid_join_syntax(self, api_client):
+    def test_invalid_join_syntax(self, error_responses):
         """Test that invalid join syntax returns error."""
-        response = api_client.get('/task_assignments?select=*,invalid_table(column)')
+        response = error_responses['/task_assignments?select=*,invalid_table(column)']
         assert response.status_code in [400, 422]
 
 class TestAPIPerformance:
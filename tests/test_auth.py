@@ -4,7 +4,7 @@ import requests
 class TestUserRegistration:
     """Test user registration functionality."""
     
-    def test_register_user_success(self, api_client):
+    def test_register_user_success(self, api_client, fresh_db):
         """Test successful user registration."""
         response = api_client.post('/rpc/register_user', json={
             'p_username': 'newuser',
@@ -18,7 +18,7 @@ class TestUserRegistration:
         assert 'message' in data
         assert data['message'] == 'User registered successfully'
     
-    def test_register_user_duplicate_username(self, api_client):
+    def test_register_user_duplicate_username(self, api_client, fresh_db):
         """Test registration with existing username fails."""
         # First registration should succeed
         response1 = api_client.post('/rpc/register_user', json={
@@ -149,31 +149,29 @@ class TestPasswordHashing:
     def test_password_hashing_verification(self, db_connection):
         """Test that password hashing and verification works correctly."""
         with db_connection.cursor() as cursor:
-            # Test password verification
             cursor.execute("""
-                SELECT (password_hash = crypt('password123', password_hash)) as is_valid
+                SELECT
+                    (password_hash = crypt('password123', password_hash)) as is_valid,
+                    (password_hash = crypt('wrongpassword', password_hash)) as is_wrong_valid
                 FROM public.users WHERE username = 'user1'
             """)
-            result = cursor.fetchone()
-            assert result[0] is True
+            is_valid, is_wrong_valid = cursor.fetchone()
+            
+            # Test password verification
+            assert is_valid is True
             
             # Test wrong password fails
-            cursor.execute("""
-                SELECT (password_hash = crypt('wrongpassword', password_hash)) as is_valid
-                FROM public.users WHERE username = 'user1'
-            """)
-            result = cursor.fetchone()
-            assert result[0] is False
+            assert is_wrong_valid is False
     
-    def test_new_user_password_hashing(self, db_connection):
+    def test_new_user_password_hashing(self, db_connection, fresh_db, bcrypt_cost):
         """Test that new users get properly hashed passwords."""
         with db_connection.cursor() as cursor:
             # Insert a new user
             cursor.execute("""
                 INSERT INTO public.users (username, password_hash)
-                VALUES ('testuser', crypt('testpassword', gen_salt('bf')))
+                VALUES ('testuser', crypt('testpassword', gen_salt('bf', %s)))
                 RETURNING user_id
-            """)
+            """, (bcrypt_cost,))
             user_id = cursor.fetchone()[0]
             
             # Verify the password
@@ -187,30 +185,31 @@ class TestPasswordHashing:
 class TestAuthenticationIntegration:
     """Test integration between registration and login."""
     
-    def test_register_then_login(self, api_client):
-        """Test that a newly registered user can login."""
-        # Register a new user
-        register_response = api_client.post('/rpc/register_user', json={
-            'p_username': 'integrationtest',
-            'p_password': 'integrationpass123'
-        })
+    def test_register_then_login(self, api_client, fresh_db):
+        """Test that newly registered users can login."""
+        # Independent users, so the server can hash their passwords in parallel
+        credentials = [
+            {'p_username': f'integrationtest{i}', 'p_password': f'integrationpass{i}'}
+            for i in range(1, 4)
+        ]
         
-        assert register_response.status_code == 201
-        register_data = register_response.json()
-        user_id = register_data['user_id']
+        # Register the new users
+        register_responses = api_client.post_many('/rpc/register_user', credentials)
+        
+        for register_response in register_responses:
+            assert register_response.status_code == 201
+        user_ids = [response.json()['user_id'] for response in register_responses]
         
         # Login with the same credentials
-        login_response = api_client.post('/rpc/login', json={
-            'p_username': 'integrationtest',
-            'p_password': 'integrationpass123'
-        })
+        login_responses = api_client.post_many('/rpc/login', credentials)
         
-        assert login_response.status_code == 200
-        login_data = login_response.json()
-        assert login_data['user_id'] == user_id
-        assert login_data['username'] == 'integrationtest'
+        for login_response, user_id, credential in zip(login_responses, user_ids, credentials):
+            assert login_response.status_code == 200
+            login_data = login_response.json()
+            assert login_data['user_id'] == user_id
+            assert login_data['username'] == credential['p_username']
     
-    def test_register_then_login_wrong_password(self, api_client):
+    def test_register_then_login_wrong_password(self, api_client, fresh_db):
         """Test that login fails with wrong password after registration."""
         # Register a new user
         register_response = api_client.post('/rpc/register_user', json={
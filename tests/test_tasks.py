@@ -1,10 +1,51 @@
+import itertools
+import uuid
+from collections import Counter
+
 import pytest
 import requests
 
+@pytest.fixture(scope='module')
+def all_tasks_response(api_client):
+    """Response listing every task, fetched once per module."""
+    return api_client.get('/tasks?select=task_id,task_name,description')
+
+@pytest.fixture(scope='module')
+def task_1_response(api_client):
+    """Response for the seeded task with ID 1, fetched once per module."""
+    return api_client.get('/tasks?task_id=eq.1&select=task_id,task_name')
+
+@pytest.fixture
+def make_task_and_assignment(api_client, fresh_db):
+    """Factory that creates a uniquely named task and assigns it to a user.
+
+    Returns ``(task_id, assignment_id)``. Depends on ``fresh_db`` so the
+    created rows are cleaned up after the test.
+    """
+    counter = itertools.count()
+
+    def _make(user_id=1):
+        task_name = f'Auto Task {next(counter)}-{uuid.uuid4().hex[:6]}'
+        create_response = api_client.post('/rpc/create_task', json={
+            'p_task_name': task_name,
+            'p_description': 'Created by make_task_and_assignment'
+        })
+        assert create_response.status_code == 201
+        task_id = create_response.json()['task_id']
+
+        assign_response = api_client.post('/rpc/assign_task', json={
+            'p_task_id': task_id,
+            'p_user_id': user_id
+        })
+        assert assign_response.status_code == 201
+        return task_id, assign_response.json()['assignment_id']
+
+    return _make
+
 class TestTaskManagement:
     """Test task management functionality."""
     
-    def test_create_task_success(self, api_client):
+    def test_create_task_success(self, api_client, fresh_db):
         """Test successful task creation."""
         response = api_client.post('/rpc/create_task', json={
             'p_task_name': 'New Test Task',
@@ -18,7 +59,7 @@ class TestTaskManagement:
         assert data['description'] == 'A test task for cleaning'
         assert 'message' in data
     
-    def test_create_task_duplicate_name(self, api_client):
+    def test_create_task_duplicate_name(self, api_client, fresh_db):
         """Test that creating a task with duplicate name fails."""
         # First creation should succeed
         response1 = api_client.post('/rpc/create_task', json={
@@ -38,32 +79,10 @@ class TestTaskManagement:
         assert 'error' in data
         assert 'already exists' in data['error'].lower()
     
-    def test_create_task_empty_name(self, api_client):
-        """Test that creating a task with empty name fails."""
-        response = api_client.post('/rpc/create_task', json={
-            'p_task_name': '',
-            'p_description': 'Test description'
-        })
-        
-        assert response.status_code == 400
-        data = response.json()
-        assert 'error' in data
-    
-    def test_create_task_missing_parameters(self, api_client):
-        """Test that creating a task with missing parameters fails."""
-        response = api_client.post('/rpc/create_task', json={
-            'p_task_name': 'Test Task'
-            # Missing p_description
-        })
-        
-        assert response.status_code == 404  # PostgREST returns 404 for missing parameters
-    
-    def test_get_all_tasks(self, api_client):
+    def test_get_all_tasks(self, all_tasks_response):
         """Test retrieving all tasks."""
-        response = api_client.get('/tasks')
-        
-        assert response.status_code == 200
-        data = response.json()
+        assert all_tasks_response.status_code == 200
+        data = all_tasks_response.json()
         assert isinstance(data, list)
         assert len(data) >= 6  # Should have at least 6 tasks from seed data
         
@@ -74,12 +93,10 @@ class TestTaskManagement:
             assert 'task_name' in task
             assert 'description' in task
     
-    def test_get_task_by_id(self, api_client):
+    def test_get_task_by_id(self, task_1_response):
         """Test retrieving a specific task by ID."""
-        response = api_client.get('/tasks?task_id=eq.1')
-        
-        assert response.status_code == 200
-        data = response.json()
+        assert task_1_response.status_code == 200
+        data = task_1_response.json()
         assert len(data) == 1
         assert data[0]['task_id'] == 1
         assert 'task_name' in data[0]
@@ -87,7 +104,7 @@ class TestTaskManagement:
 class TestTaskAssignment:
     """Test task assignment functionality."""
     
-    def test_assign_task_to_user_success(self, api_client):
+    def test_assign_task_to_user_success(self, api_client, fresh_db):
         """Test successful task assignment."""
         # Create a new task first to ensure it's not already assigned
         create_response = api_client.post('/rpc/create_task', json={
@@ -111,45 +128,10 @@ class TestTaskAssignment:
         assert data['user_id'] == 1
         assert 'message' in data
     
-    def test_assign_task_invalid_task_id(self, api_client):
-        """Test assignment with non-existent task ID fails."""
-        response = api_client.post('/rpc/assign_task', json={
-            'p_task_id': 999,
-            'p_user_id': 1
-        })
-        
-        assert response.status_code == 404
-        data = response.json()
-        assert 'error' in data
-    
-    def test_assign_task_invalid_user_id(self, api_client):
-        """Test assignment with non-existent user ID fails."""
-        response = api_client.post('/rpc/assign_task', json={
-            'p_task_id': 1,
-            'p_user_id': 999
-        })
-        
-        assert response.status_code == 404
-        data = response.json()
-        assert 'error' in data
-    
-    def test_assign_task_already_assigned(self, api_client):
+    def test_assign_task_already_assigned(self, api_client, make_task_and_assignment):
         """Test that assigning an already assigned task fails."""
-        # Create a new task first
-        create_response = api_client.post('/rpc/create_task', json={
-            'p_task_name': 'Test Already Assigned Task',
-            'p_description': 'Task for testing duplicate assignment'
-        })
-        assert create_response.status_code == 201
-        task_data = create_response.json()
-        task_id = task_data['task_id']
-        
-        # First assignment should succeed
-        response1 = api_client.post('/rpc/assign_task', json={
-            'p_task_id': task_id,
-            'p_user_id': 2
-        })
-        assert response1.status_code == 201
+        # Create a new task and assign it once
+        task_id, _ = make_task_and_assignment(user_id=2)
         
         # Second assignment of same task should fail
         response2 = api_client.post('/rpc/assign_task', json={
@@ -163,7 +145,7 @@ class TestTaskAssignment:
     
     def test_get_user_assignments(self, api_client):
         """Test retrieving assignments for a specific user."""
-        response = api_client.get('/task_assignments?user_id=eq.1')
+        response = api_client.get('/task_assignments?user_id=eq.1&select=assignment_id,user_id')
         
         assert response.status_code == 200
         data = response.json()
@@ -176,10 +158,13 @@ class TestTaskAssignment:
 class TestTaskCompletion:
     """Test task completion functionality."""
     
-    def test_complete_task_success(self, api_client):
+    def test_complete_task_success(self, api_client, make_task_and_assignment):
         """Test successful task completion."""
+        # Create and assign a task so the test does not depend on seed assignment IDs
+        _, assignment_id = make_task_and_assignment(user_id=1)
+        
         response = api_client.post('/rpc/complete_task', json={
-            'p_assignment_id': 1,
+            'p_assignment_id': assignment_id,
             'p_user_id': 1,
             'p_notes': 'Task completed successfully'
         })
@@ -201,11 +186,14 @@ class TestTaskCompletion:
         data = response.json()
         assert 'error' in data
     
-    def test_complete_task_already_completed(self, api_client):
+    def test_complete_task_already_completed(self, api_client, make_task_and_assignment):
         """Test that completing an already completed task fails."""
+        # Create and assign a task so the test does not depend on seed assignment IDs
+        _, assignment_id = make_task_and_assignment(user_id=2)
+        
         # First completion should succeed
         response1 = api_client.post('/rpc/complete_task', json={
-            'p_assignment_id': 2,
+            'p_assignment_id': assignment_id,
             'p_user_id': 2,
             'p_notes': 'First completion'
         })
@@ -213,7 +201,7 @@ class TestTaskCompletion:
         
         # Second completion should fail
         response2 = api_client.post('/rpc/complete_task', json={
-            'p_assignment_id': 2,
+            'p_assignment_id': assignment_id,
             'p_user_id': 2,
             'p_notes': 'Second completion'
         })
@@ -221,23 +209,11 @@ class TestTaskCompletion:
         assert response2.status_code == 400
         data = response2.json()
         assert 'error' in data
-    
-    def test_complete_task_invalid_assignment(self, api_client):
-        """Test completing non-existent assignment fails."""
-        response = api_client.post('/rpc/complete_task', json={
-            'p_assignment_id': 999,
-            'p_user_id': 1,
-            'p_notes': 'Invalid assignment'
-        })
-        
-        assert response.status_code == 404
-        data = response.json()
-        assert 'error' in data
 
 class TestTaskRotation:
     """Test automatic task rotation functionality."""
     
-    def test_rotate_tasks_success(self, api_client):
+    def test_rotate_tasks_success(self, api_client, fresh_db):
         """Test successful task rotation."""
         response = api_client.post('/rpc/rotate_tasks', json={})
         
@@ -246,35 +222,37 @@ class TestTaskRotation:
         assert 'message' in data
         assert 'rotated' in data['message'].lower()
     
-    def test_rotation_creates_new_assignments(self, api_client):
+    def test_rotation_creates_new_assignments(self, api_client, fresh_db):
         """Test that rotation creates new assignments."""
-        # Get initial assignment count
-        initial_response = api_client.get('/task_assignments')
-        initial_count = len(initial_response.json())
+        # Get initial assignment count (PostgREST reports it in Content-Range, no rows sent)
+        initial_response = api_client.head('/task_assignments', headers={'Prefer': 'count=exact'})
+        assert initial_response.status_code == 200
+        initial_count = int(initial_response.headers['Content-Range'].split('/')[-1])
         
         # Perform rotation
         rotation_response = api_client.post('/rpc/rotate_tasks', json={})
         assert rotation_response.status_code == 200
         
         # Check that new assignments were created
-        final_response = api_client.get('/task_assignments')
-        final_count = len(final_response.json())
+        final_response = api_client.head('/task_assignments', headers={'Prefer': 'count=exact'})
+        assert final_response.status_code == 200
+        final_count = int(final_response.headers['Content-Range'].split('/')[-1])
         
         assert final_count > initial_count
     
-    def test_rotation_distributes_evenly(self, api_client):
+    def test_rotation_distributes_evenly(self, api_client, fresh_db):
         """Test that rotation distributes tasks evenly among users."""
         # Perform rotation
         response = api_client.post('/rpc/rotate_tasks', json={})
         assert response.status_code == 200
         
-        # Get assignments for each user
-        user1_assignments = api_client.get('/task_assignments?user_id=eq.1').json()
-        user2_assignments = api_client.get('/task_assignments?user_id=eq.2').json()
-        user3_assignments = api_client.get('/task_assignments?user_id=eq.3').json()
+        # Get every user's assignments in one request and count them per user
+        assignments_response = api_client.get('/task_assignments?user_id=in.(1,2,3)&select=user_id')
+        assert assignments_response.status_code == 200
+        per_user = Counter(assignment['user_id'] for assignment in assignments_response.json())
         
         # Check that assignments are distributed (allow some variance)
-        counts = [len(user1_assignments), len(user2_assignments), len(user3_assignments)]
+        counts = [per_user.get(user_id, 0) for user_id in (1, 2, 3)]
         max_count = max(counts)
         min_count = min(counts)
         
@@ -284,22 +262,10 @@ class TestTaskRotation:
 class TestTaskRejection:
     """Test task rejection and redo functionality."""
 
-    def test_reject_and_redo_task(self, api_client):
+    def test_reject_and_redo_task(self, api_client, make_task_and_assignment):
         """Test that a rejected task can be redone and reviewed again."""
         # Create and assign a task
-        create_response = api_client.post('/rpc/create_task', json={
-            'p_task_name': 'Redo Test Task',
-            'p_description': 'Test redo after rejection'
-        })
-        assert create_response.status_code == 201
-        task_id = create_response.json()['task_id']
-
-        assign_response = api_client.post('/rpc/assign_task', json={
-            'p_task_id': task_id,
-            'p_user_id': 1
-        })
-        assert assign_response.status_code == 201
-        assignment_id = assign_response.json()['assignment_id']
+        _, assignment_id = make_task_and_assignment(user_id=1)
 
         # Complete the task
         complete_response = api_client.post('/rpc/complete_task', json={
@@ -318,7 +284,7 @@ class TestTaskRejection:
         assert reject_response.status_code == 200
 
         # Fetch assignment and check is_approved is false, completed_at is set
-        assignments_response = api_client.get(f'/task_assignments?assignment_id=eq.{assignment_id}')
+        assignments_response = api_client.get(f'/task_assignments?assignment_id=eq.{assignment_id}&select=assignment_id,user_id,is_approved,completed_at')
         assert assignments_response.status_code == 200
         assignment = assignments_response.json()[0]
         assert assignment['is_approved'] is False
@@ -333,7 +299,7 @@ class TestTaskRejection:
         assert redo_response.status_code == 200
 
         # Fetch assignment and check is_approved is null, completed_at is updated
-        assignments_response = api_client.get(f'/task_assignments?assignment_id=eq.{assignment_id}')
+        assignments_response = api_client.get(f'/task_assignments?assignment_id=eq.{assignment_id}&select=assignment_id,user_id,is_approved,completed_at')
         assert assignments_response.status_code == 200
         assignment = assignments_response.json()[0]
         assert assignment['is_approved'] is None
@@ -343,22 +309,10 @@ class TestTaskRejection:
         # (simulate review by directly updating is_approved for test, or use reject_task with approve logic if available)
         # For now, just check that the workflow allows redo and resets state
 
-    def test_cannot_complete_already_completed_task(self, api_client):
+    def test_cannot_complete_already_completed_task(self, api_client, make_task_and_assignment):
         """Test that completing an already completed and not rejected task returns an error."""
         # Create and assign a task
-        create_response = api_client.post('/rpc/create_task', json={
-            'p_task_name': 'Already Completed Task',
-            'p_description': 'Should not allow double complete'
-        })
-        assert create_response.status_code == 201
-        task_id = create_response.json()['task_id']
-
-        assign_response = api_client.post('/rpc/assign_task', json={
-            'p_task_id': task_id,
-            'p_user_id': 1
-        })
-        assert assign_response.status_code == 201
-        assignment_id = assign_response.json()['assignment_id']
+        _, assignment_id = make_task_and_assignment(user_id=1)
 
         # Complete the task
         complete_response = api_client.post('/rpc/complete_task', json={
@@ -378,28 +332,38 @@ class TestTaskRejection:
         data = redo_response.json()
         assert 'error' in data
 
+class TestTaskErrorResponses:
+    """Test that invalid task, assignment and completion input is rejected."""
+    
+    @pytest.mark.parametrize('endpoint, payload, expected_status, expects_error', [
+        pytest.param('/rpc/create_task', {'p_task_name': '', 'p_description': 'Test description'},
+                     400, True, id='create-empty-name'),
+        # PostgREST returns 404 when function parameters don't match
+        pytest.param('/rpc/create_task', {'p_task_name': 'Test Task'},
+                     404, False, id='create-missing-parameters'),
+        pytest.param('/rpc/assign_task', {'p_task_id': 999, 'p_user_id': 1},
+                     404, True, id='assign-invalid-task-id'),
+        pytest.param('/rpc/assign_task', {'p_task_id': 1, 'p_user_id': 999},
+                     404, True, id='assign-invalid-user-id'),
+        pytest.param('/rpc/complete_task', {'p_assignment_id': 999, 'p_user_id': 1, 'p_notes': 'Invalid assignment'},
+                     404, True, id='complete-invalid-assignment'),
+    ])
+    def test_error_responses(self, api_client, endpoint, payload, expected_status, expects_error):
+        """Test that invalid input to the task RPCs returns the expected error."""
+        response = api_client.post(endpoint, json=payload)
+        
+        assert response.status_code == expected_status
+        if expects_error:
+            data = response.json()
+            assert 'error' in data
+
 class TestTaskIntegration:
     """Test integration between different task operations."""
     
-    def test_full_task_workflow(self, api_client):
+    def test_full_task_workflow(self, api_client, make_task_and_assignment):
         """Test complete task workflow: create -> assign -> complete -> reject -> reassign."""
-        # 1. Create a new task
-        create_response = api_client.post('/rpc/create_task', json={
-            'p_task_name': 'Integration Test Task',
-            'p_description': 'Test workflow'
-        })
-        assert create_response.status_code == 201
-        task_data = create_response.json()
-        task_id = task_data['task_id']
-        
-        # 2. Assign the task
-        assign_response = api_client.post('/rpc/assign_task', json={
-            'p_task_id': task_id,
-            'p_user_id': 1
-        })
-        assert assign_response.status_code == 201
-        assignment_data = assign_response.json()
-        assignment_id = assignment_data['assignment_id']
+        # 1-2. Create a new task and assign it
+        task_id, assignment_id = make_task_and_assignment(user_id=1)
         
         # 3. Complete the task
         complete_response = api_client.post('/rpc/complete_task', json={
@@ -418,11 +382,11 @@ class TestTaskIntegration:
         assert reject_response.status_code == 200
         
         # 5. Verify task is NOT reassigned (should only be one assignment)
-        assignments_response = api_client.get(f'/task_assignments?task_id=eq.{task_id}')
+        assignments_response = api_client.get(f'/task_assignments?task_id=eq.{task_id}&select=assignment_id,user_id,is_approved')
         assert assignments_response.status_code == 200
         assignments = assignments_response.json()
         # Should have only one assignment for this task
         assert len(assignments) == 1
         assert assignments[0]['assignment_id'] == assignment_id
         assert assignments[0]['user_id'] == 1
-        assert assignments[0]['is_approved'] is False 
\ No newline at end of file
+        assert assignments[0]['is_approved'] is False
\ No newline at end of file